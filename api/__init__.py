@@ -14,6 +14,7 @@ from .exceptions.badrequest import BadRequestException
 from .exceptions.validation import ValidationException
 
 from .neo4j import init_driver
+from .indexes import init_app as init_indexes
 
 from .routes.auth import auth_routes
 from .routes.account import account_routes
@@ -32,6 +33,9 @@ def create_app(test_config=None):
         NEO4J_USERNAME=os.getenv('NEO4J_USERNAME'),
         NEO4J_PASSWORD=os.getenv('NEO4J_PASSWORD'),
         NEO4J_DATABASE=os.getenv('NEO4J_DATABASE'),
+        NEO4J_POOL_SIZE=os.getenv('NEO4J_POOL_SIZE'),
+        NEO4J_ACQUISITION_TIMEOUT=os.getenv('NEO4J_ACQUISITION_TIMEOUT'),
+        NEO4J_MAX_LIFETIME=os.getenv('NEO4J_MAX_LIFETIME'),
         JWT_SECRET_KEY=os.getenv('JWT_SECRET'),
         JWT_AUTH_HEADER_PREFIX="Bearer",
         JWT_VERIFY_CLAIMS="signature",
@@ -55,11 +59,16 @@ def create_app(test_config=None):
             app.config.get('NEO4J_PASSWORD'),
         )
 
+    # CLI command to create the listing indexes
+    init_indexes(app)
+
     # JWT
     jwt = JWTManager(app)
 
     CORS(app, 
-        resources={r"/*": {"origins": ["http://localhost:3000", "http://127.0.0.1:3000"]}}
+        resources={r"/*": {"origins": ["http://localhost:3000", "http://127.0.0.1:3000"]}},
+        # Let the frontend read the paging headers on movie listings
+        expose_headers=["X-Next-Cursor", "X-Total-Count"],
     )
     
     # Register Routes
@@ -0,0 +1,183 @@
+import inspect
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+
+"""
+A small in-process result cache for read-only DAO methods.
+
+Entries expire after a per-entry time to live (TTL), and can be dropped early
+by key prefix when a write makes them stale.
+"""
+
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    A thread-safe mapping of string keys to values that expire after a TTL.
+    When the cache holds `maxsize` entries, the least recently used entry is
+    evicted to make room for a new one.
+    """
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize: int = maxsize
+        self._entries: dict[str, tuple[float, Any]] = {}
+        self._generation: int = 0
+        # The generation at which each prefix was last invalidated, and the
+        # newest generation among the records dropped to bound their number
+        self._invalidated: dict[str, int] = {}
+        self._floor: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """
+        A counter that changes every time entries are invalidated.  Read it
+        before computing a value and pass it to :meth:`set`, so that a value
+        computed from data that was invalidated meanwhile is not stored.
+        """
+        with self._lock:
+            return self._generation
+
+    def _is_stale(self, key: str, generation: int) -> bool:
+        """
+        Whether :param:`key` has been invalidated since :param:`generation`,
+        checking only the prefixes of the key itself.
+        """
+        if generation < self._floor:
+            return True
+
+        return any(
+            self._invalidated.get(key[:i], -1) > generation
+            for i in range(len(key) + 1)
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Retrieve the value stored under a key if it has not expired.
+
+        :param key: The key under which the value was stored
+        :type key: str
+        :param default: The value to return on a miss, defaults to None
+        :type default: Any
+        :return: The cached value, or :param:`default` if the key is missing
+            or has expired
+        :rtype: Any
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return default
+
+            # Move the entry to the end so that eviction finds it last
+            self._entries[key] = self._entries.pop(key)
+
+            return value
+
+    def set(
+            self,
+            key: str,
+            value: Any,
+            ttl: float,
+            generation: Optional[int] = None,
+    ) -> None:
+        """
+        Store a value under a key for a number of seconds.
+
+        :param key: The key under which to store the value
+        :type key: str
+        :param value: The value to store
+        :type value: Any
+        :param ttl: The number of seconds until the entry expires
+        :type ttl: float
+        :param generation: The :attr:`generation` read before the value was
+            computed; if the key has been invalidated since, the value is not
+            stored, defaults to None which always stores it
+        :type generation: Optional[int]
+        """
+        with self._lock:
+            if generation is not None and self._is_stale(key, generation):
+                return
+
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.maxsize:
+                del self._entries[next(iter(self._entries))]
+
+            self._entries[key] = (time.monotonic() + ttl, value)
+
+    def invalidate(self, prefix: str = "") -> None:
+        """
+        Remove every entry whose key starts with a prefix.
+
+        :param prefix: The prefix of the keys to remove, defaults to "" which
+            removes every entry
+        :type prefix: str
+        """
+        with self._lock:
+            self._generation += 1
+
+            self._invalidated.pop(prefix, None)
+            if len(self._invalidated) >= self.maxsize:
+                oldest = next(iter(self._invalidated))
+                self._floor = self._invalidated.pop(oldest)
+            self._invalidated[prefix] = self._generation
+
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+
+"""
+The cache shared by every DAO in the process
+"""
+cache = TTLCache()
+
+
+def cached(
+        ttl: float,
+        key: Callable[..., str],
+        store: Optional[TTLCache] = None,
+) -> Callable:
+    """
+    Cache the return value of a function.
+
+    :param ttl: The number of seconds to keep each result
+    :type ttl: float
+    :param key: A function that receives the decorated function's arguments
+        by name, with defaults applied, and returns the cache key
+    :type key: Callable[..., str]
+    :param store: The cache to keep results in, defaults to None which uses
+        :data:`cache`
+    :type store: Optional[TTLCache]
+    :return: A decorator that wraps a function with the cache
+    :rtype: Callable
+    """
+    if store is None:
+        store = cache
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            cache_key = key(**bound.arguments)
+
+            value = store.get(cache_key, _MISSING)
+            if value is _MISSING:
+                generation = store.generation
+                value = func(*args, **kwargs)
+                store.set(cache_key, value, ttl, generation=generation)
+
+            return value
+
+        return wrapper
+
+    return decorator
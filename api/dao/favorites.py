@@ -1,3 +1,4 @@
+from api.dao.movies import clear_user_favorites
 from api.data import popular, goodfellas
 from api.exceptions.notfound import NotFoundException
 
@@ -41,6 +42,9 @@ class FavoriteDAO:
         # TODO: Execute the transaction function within a Write Transaction
         # TODO: Return movie details and `favorite` property
 
+        # Listings take their `favorite` flags from the user's cached set
+        clear_user_favorites(user_id)
+
         return {
             **goodfellas,
             "favorite": False
@@ -61,6 +65,9 @@ class FavoriteDAO:
         # TODO: Execute the transaction function within a Write Transaction
         # TODO: Return movie details and `favorite` property
 
+        # Listings take their `favorite` flags from the user's cached set
+        clear_user_favorites(user_id)
+
         return {
             **goodfellas,
             "favorite": False
@@ -1,14 +1,383 @@
-from typing import Optional
-
-from neo4j import Transaction, Driver
-from neo4j.graph import Node
-
+import base64
+import copy
+import inspect
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+from typing import Callable, Optional
+
+from flask import current_app
+from neo4j import READ_ACCESS, Session, Transaction, Driver
+
+from api.cache import TTLCache, cache, cached
 from api.data import goodfellas
 
+from api.exceptions.badrequest import BadRequestException
 from api.exceptions.notfound import NotFoundException
 from api.data import popular
 
 
+"""
+The movie properties that listings may be sorted by, and the directions in
+which they may be sorted
+"""
+ALLOWED_SORTS = frozenset({"title", "released", "imdbRating", "budget"})
+ALLOWED_ORDERS = frozenset({"ASC", "DESC"})
+
+"""
+The movie properties returned by listings for each `fields` value; `None`
+returns every property.  A movie card only needs the `list` properties, so
+listings default to `list` and clients ask for `full` with `?fields=full`.
+Movie details from :meth:`MovieDAO.find_by_id` always carry every property.
+"""
+MOVIE_PROJECTIONS = {
+    "list": ("tmdbId", "title", "poster", "released", "imdbRating", "plot"),
+    "full": None,
+}
+
+
+def _projection(fields: str, sort: str) -> str:
+    """
+    Build the map projection returned for each movie in a listing.
+
+    The sort property is always included so a cursor can be built from the
+    last movie on a page.
+
+    :param fields: A key of :data:`MOVIE_PROJECTIONS`
+    :type fields: str
+    :param sort: The node property by which the listing is sorted
+    :type sort: str
+    :return: The body of a Cypher map projection, e.g. `.title, .poster`
+    :rtype: str
+    """
+    properties = MOVIE_PROJECTIONS[fields]
+    if properties is None:
+        return ".*"
+
+    if sort not in properties:
+        properties = (*properties, sort)
+
+    return ", ".join(f".{p}" for p in properties)
+
+
+def _movie_query(
+        sort: str,
+        order: str,
+        keyset: bool = False,
+        fields: str = "list",
+) -> str:
+    """
+    Build the Cypher query used by :meth:`MovieDAO.get_movies`.
+
+    Offset queries page with `SKIP $skip`.  Keyset queries instead resume
+    after the `(sort value, tmdbId)` pair bound to `$after_val` and
+    `$after_id`, so the database can seek straight to the next page rather
+    than reading and discarding every skipped row.
+
+    :param sort: The node property by which we sort the movies
+    :type sort: str
+    :param order: The order in which we sort the movies
+    :type order: str
+    :param keyset: Whether to build the keyset variant of the query,
+        defaults to False
+    :type keyset: bool
+    :param fields: A key of :data:`MOVIE_PROJECTIONS` naming the properties
+        to return, defaults to "list"
+    :type fields: str
+    :return: The Cypher query for the input sort specification
+    :rtype: str
+    """
+    projection = _projection(fields, sort)
+
+    # Break ties on tmdbId so that pages never overlap or skip movies that
+    # share a sort value
+    order_by = f"ORDER BY m.`{sort}` {order}, m.tmdbId {order}"
+
+    if not keyset:
+        where = [f"WHERE m.`{sort}` IS NOT NULL"]
+        page = ["SKIP $skip", "LIMIT $limit"]
+    else:
+        op = ">" if order == "ASC" else "<"
+        where = [
+            f"WHERE m.`{sort}` IS NOT NULL",
+            f"  AND (m.`{sort}` {op} $after_val",
+            f"    OR (m.`{sort}` = $after_val AND m.tmdbId {op} $after_id))",
+        ]
+        page = ["LIMIT $limit"]
+
+    # Pages are shared by every user, so `favorite` flags are added after the
+    # query from the user's cached favorites rather than matched here
+    return "\n".join(
+        [
+            "MATCH (m:Movie)",
+            *where,
+            f"RETURN m {{ {projection} }} AS movie",
+            order_by,
+            *page,
+        ]
+    )
+
+
+"""
+Every listing query, built once at import time and keyed by
+`(sort, order, keyset, fields)`, so each request sends a byte-identical string
+and only whitelisted values ever reach the Cypher
+"""
+_MOVIE_QUERIES = {
+    (sort, order, keyset, fields): _movie_query(sort, order, keyset, fields)
+    for sort in ALLOWED_SORTS
+    for order in ALLOWED_ORDERS
+    for keyset in (False, True)
+    for fields in MOVIE_PROJECTIONS
+}
+
+
+def encode_cursor(movie: dict, sort: str) -> str:
+    """
+    Encode the position of a movie in a listing as an opaque cursor.
+
+    :param movie: The last movie on the current page
+    :type movie: dict
+    :param sort: The node property by which the listing is sorted
+    :type sort: str
+    :return: A URL-safe cursor that can be passed back as `after`
+    :rtype: str
+    """
+    position = json.dumps([movie.get(sort), movie.get("tmdbId")])
+
+    return base64.urlsafe_b64encode(position.encode("utf8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor created by :func:`encode_cursor`.
+
+    :param cursor: The cursor supplied by the client
+    :type cursor: str
+    :return: The `(sort value, tmdbId)` pair of the last movie already seen
+    :rtype: tuple
+    :raises BadRequestException: If the cursor is malformed
+    """
+    try:
+        value = json.loads(base64.urlsafe_b64decode(cursor))
+    except (ValueError, TypeError):
+        raise BadRequestException(f"Invalid cursor {cursor}")
+
+    if not (isinstance(value, list) and len(value) == 2
+            and all(_is_cursor_scalar(part) for part in value)):
+        raise BadRequestException(f"Invalid cursor {cursor}")
+
+    after_val, after_id = value
+
+    return after_val, after_id
+
+
+def _is_cursor_scalar(value) -> bool:
+    return (isinstance(value, (str, int, float))
+            and not isinstance(value, bool))
+
+
+"""
+Queries counting the movies that a listing sorted by each property can return
+"""
+_COUNT_QUERIES = {
+    sort: "\n".join(
+        [
+            "MATCH (m:Movie)",
+            f"WHERE m.`{sort}` IS NOT NULL",
+            "RETURN count(m) AS count",
+        ]
+    )
+    for sort in ALLOWED_SORTS
+}
+
+"""
+The number of seconds for which a page of movies is served from the cache
+"""
+LIST_CACHE_TTL = 60
+
+
+def _listing_key(
+        sort: str,
+        order: str,
+        limit: int,
+        skip: int,
+        after: Optional[tuple],
+        fields: str,
+        **_,
+) -> str:
+    """
+    Build the cache key for a page of movies returned by :meth:`MovieDAO.all`.
+    Pages are the same for every user, so the key does not include one.
+
+    :return: The cache key for the page described by the arguments
+    :rtype: str
+    """
+    return (
+        f"movies:all:{sort}:{order.upper()}:{skip}:{limit}:{after}:{fields}"
+    )
+
+
+def _overlay_favorites(func: Callable) -> Callable:
+    """
+    Call a `MovieDAO` method that takes a `user_id` without one, so that the
+    result and any cache behind it are shared by every user, then flag the
+    user's favorites on a copy of the result.
+
+    :param func: A method with a `user_id` parameter that returns a movie or
+        a list of movies
+    :type func: Callable
+    :return: The wrapped method
+    :rtype: Callable
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        user_id = bound.arguments.pop("user_id", None)
+
+        # The result may be cached, so only ever return copies of it
+        result = func(*bound.args, **bound.kwargs)
+        if isinstance(result, dict):
+            return self._with_favorites([copy.deepcopy(result)], user_id)[0]
+
+        return self._with_favorites(result, user_id)
+
+    return wrapper
+
+
+"""
+The number of seconds for which a count is served from the cache, and the
+smallest count worth caching; smaller counts are cheap to recompute
+"""
+COUNT_CACHE_TTL = 300
+COUNT_CACHE_THRESHOLD = 1000
+
+"""
+Worker threads used to run queries alongside the one serving a request
+"""
+executor = ThreadPoolExecutor(max_workers=8)
+
+"""
+Worker threads that load the next page of a listing ahead of time.  They are
+kept apart from :data:`executor`, which requests wait on, and a prefetch is
+dropped rather than queued when every slot is busy.
+"""
+PREFETCH_WORKERS = 2
+_PREFETCH_POOL = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS)
+_PREFETCH_SLOTS = threading.BoundedSemaphore(PREFETCH_WORKERS)
+
+logger = logging.getLogger(__name__)
+
+
+def _prefetch_done(future: Future) -> None:
+    _PREFETCH_SLOTS.release()
+
+    error = future.exception()
+    if error is not None:
+        logger.warning("Prefetching a page of movies failed", exc_info=error)
+
+
+def _prefetch_next_page(func: Callable) -> Callable:
+    """
+    After :meth:`MovieDAO.all` returns a full offset page, load the following
+    page into the cache on the prefetch pool, unless it is cached already or
+    the pool is busy.  A request for that page arrives at the coalescing
+    layer and waits for the prefetch rather than running the query again.
+
+    :param func: The cached listing method
+    :type func: Callable
+    :return: The wrapped method
+    :rtype: Callable
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        page = bound.arguments
+
+        movies = func(*args, **kwargs)
+
+        if page["after"] is None and len(movies) == page["limit"]:
+            following = {**page, "skip": page["skip"] + page["limit"]}
+
+            if (cache.get(_listing_key(**following)) is None
+                    and _PREFETCH_SLOTS.acquire(blocking=False)):
+                _PREFETCH_POOL.submit(func, **following).add_done_callback(
+                    _prefetch_done)
+
+        return movies
+
+    return wrapper
+
+
+def _coalesced(func: Callable) -> Callable:
+    """
+    Share one call of a `MovieDAO` method between identical concurrent calls
+    through :meth:`MovieDAO._coalesce`.
+
+    :param func: The method to coalesce
+    :type func: Callable
+    :return: The wrapped method
+    :rtype: Callable
+    """
+    signature = inspect.signature(func)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        self, *values = bound.arguments.values()
+
+        return self._coalesce(
+            (func.__name__, *values), lambda: func(*args, **kwargs))
+
+    return wrapper
+
+"""
+Movie details looked up by :meth:`MovieDAO.find_by_id`, keyed by tmdbId and
+database.  Details only change when a movie is rated, so they are kept for an
+hour, and the least recently used of :data:`MOVIE_CACHE_SIZE` are evicted.
+"""
+MOVIE_CACHE_SIZE = 10_000
+MOVIE_CACHE_TTL = 3600
+movie_cache = TTLCache(maxsize=MOVIE_CACHE_SIZE)
+
+
+def clear_movie_cache(movie_id: Optional[str] = None) -> None:
+    """
+    Forget the cached details of a movie, after a write that changes them.
+
+    :param movie_id: The tmdbId of the movie, defaults to None which forgets
+        every movie
+    :type movie_id: Optional[str]
+    """
+    if movie_id is None:
+        movie_cache.invalidate("movie:")
+    else:
+        movie_cache.invalidate(f"movie:{movie_id}:")
+
+
+def _favorites_key(user_id: str) -> str:
+    # The trailing colon stops user "u1" from matching "u10"
+    return f"movies:favorites:{user_id}:"
+
+
+def clear_user_favorites(user_id: str) -> None:
+    """
+    Forget the cached favorites of a user, after they add or remove one.
+
+    :param user_id: The ID of the user
+    :type user_id: str
+    """
+    cache.invalidate(_favorites_key(user_id))
+
+
 class MovieDAO:
     """
     The constructor expects an instance of the Neo4j Driver, which will be
@@ -16,6 +385,65 @@ class MovieDAO:
     """
     def __init__(self, driver: Driver) -> None:
         self.driver: Driver = driver
+        self.database: Optional[str] = (
+            current_app.config.get("NEO4J_DATABASE") or None)
+
+    def _read_session(self) -> Session:
+        """
+        Open a session for read queries against the configured database.
+
+        Naming the database saves the driver a home-database lookup when the
+        session opens, and read access lets cluster reads go to followers.
+
+        :return: A new read session
+        :rtype: Session
+        """
+        return self.driver.session(
+            database=self.database,
+            default_access_mode=READ_ACCESS,
+            fetch_size=1000,
+        )
+
+    """
+    Futures for the listing queries currently being run, keyed by their
+    arguments, so that identical concurrent requests share one query
+    """
+    _INFLIGHT: dict[tuple, Future] = {}
+    _INFLIGHT_LOCK = threading.Lock()
+
+    @classmethod
+    def _coalesce(cls, key: tuple, fetch: Callable[[], list]) -> list:
+        """
+        Run :param:`fetch`, unless an identical call is already running, in
+        which case wait for and return its result instead.
+
+        :param key: The arguments that identify the query
+        :type key: tuple
+        :param fetch: A function that runs the query
+        :type fetch: Callable[[], list]
+        :return: The result of the query
+        :rtype: list
+        """
+        with cls._INFLIGHT_LOCK:
+            future = cls._INFLIGHT.get(key)
+            leader = future is None
+            if leader:
+                future = cls._INFLIGHT[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fetch()
+            future.set_result(result)
+
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with cls._INFLIGHT_LOCK:
+                del cls._INFLIGHT[key]
 
     """
      This method should return a paginated list of movies ordered by the `sort`
@@ -26,6 +454,10 @@ class MovieDAO:
      signify whether the user has added the movie to their "My Favorites" list.
     """
     # tag::all[]
+    @_overlay_favorites
+    @_prefetch_next_page
+    @cached(ttl=LIST_CACHE_TTL, key=_listing_key)
+    @_coalesced
     def all(
             self,
             sort: str,
@@ -33,7 +465,9 @@ class MovieDAO:
             limit: int = 6,
             skip: int = 0,
             user_id: Optional[str] = None,
-    ) -> list[Node]:
+            after: Optional[tuple] = None,
+            fields: str = "list",
+    ) -> list[dict]:
         """
         Retrieve all movies from a database subject to specified criteria.
 
@@ -50,21 +484,64 @@ class MovieDAO:
         :param user_id: The ID of the user who is making the transaction,
             defaults to None
         :type user_id: Optional[str]
-        :return: A list of movie nodes that align with the query constructed
+        :param after: The `(sort value, tmdbId)` pair of the last movie on
+            the previous page; when supplied, the page starts after it and
+            :param:`skip` is ignored, defaults to None
+        :type after: Optional[tuple]
+        :param fields: A key of :data:`MOVIE_PROJECTIONS` naming the movie
+            properties to return, defaults to "list"
+        :type fields: str
+        :return: A list of movie maps that align with the query constructed
             from the input specifications
-        :rtype: list[Node]
+        :rtype: list[dict]
+        :raises BadRequestException: If :param:`sort`, :param:`order` or
+            :param:`fields` is not one of the supported values
         """
-        with self.driver.session() as session:
+        # The decorators run this without a user_id and cache the result for
+        # everyone, then flag the user's favorites on a copy of the page
+        order = order.upper()
+        if sort not in ALLOWED_SORTS or order not in ALLOWED_ORDERS:
+            raise BadRequestException(f"Cannot sort movies by {sort} {order}")
+        if fields not in MOVIE_PROJECTIONS:
+            raise BadRequestException(f"Cannot list {fields} movies")
+
+        with self._read_session() as session:
             return session.execute_read(
                 transaction_function=self.get_movies,
                 sort=sort,
                 order=order,
                 limit=limit,
                 skip=skip,
-                user_id=user_id,
+                after=after,
+                fields=fields,
             )
     # end::all[]
 
+    def count(self, sort: str) -> int:
+        """
+        Count the movies that a listing sorted by :param:`sort` can return.
+
+        Counts of at least :data:`COUNT_CACHE_THRESHOLD` movies are cached for
+        :data:`COUNT_CACHE_TTL` seconds.
+
+        :param sort: The node property by which the listing is sorted
+        :type sort: str
+        :return: The total number of movies in the listing
+        :rtype: int
+        """
+        key = f"count:movies:{sort}"
+
+        total = cache.get(key)
+        if total is None:
+            with self._read_session() as session:
+                total = session.execute_read(
+                    transaction_function=self.count_movies, sort=sort)
+
+            if total >= COUNT_CACHE_THRESHOLD:
+                cache.set(key, total, COUNT_CACHE_TTL)
+
+        return total
+
     """
     This method should return a paginated list of movies that have a relationship to the
     supplied Genre.
@@ -78,12 +555,18 @@ class MovieDAO:
     signify whether the user has added the movie to their "My Favorites" list.
     """
     # tag::getByGenre[]
+    @_overlay_favorites
+    @cached(
+        ttl=LIST_CACHE_TTL,
+        key=lambda name, sort, order, limit, skip, **_:
+            f"movies:genre:{name}:{sort}:{order}:{skip}:{limit}",
+    )
     def get_by_genre(self, name, sort='title', order='ASC', limit=6, skip=0, user_id=None):
         # TODO: Get Movies in a Genre
         # TODO: The Cypher string will be formated so remember to escape the braces: {{name: $name}}
         # MATCH (m:Movie)-[:IN_GENRE]->(:Genre {name: $name})
 
-        return popular[skip:limit]
+        return popular[skip:skip + limit]
     # end::getByGenre[]
 
     """
@@ -99,12 +582,18 @@ class MovieDAO:
     signify whether the user has added the movie to their "My Favorites" list.
     """
     # tag::getForActor[]
+    @_overlay_favorites
+    @cached(
+        ttl=LIST_CACHE_TTL,
+        key=lambda id, sort, order, limit, skip, **_:
+            f"movies:actor:{id}:{sort}:{order}:{skip}:{limit}",
+    )
     def get_for_actor(self, id, sort='title', order='ASC', limit=6, skip=0, user_id=None):
         # TODO: Get Movies for an Actor
         # TODO: The Cypher string will be formated so remember to escape the braces: {{tmdbId: $id}}
         # MATCH (:Person {tmdbId: $id})-[:ACTED_IN]->(m:Movie)
 
-        return popular[skip:limit]
+        return popular[skip:skip + limit]
     # end::getForActor[]
 
     """
@@ -120,12 +609,18 @@ class MovieDAO:
     signify whether the user has added the movie to their "My Favorites" list.
     """
     # tag::getForDirector[]
+    @_overlay_favorites
+    @cached(
+        ttl=LIST_CACHE_TTL,
+        key=lambda id, sort, order, limit, skip, **_:
+            f"movies:director:{id}:{sort}:{order}:{skip}:{limit}",
+    )
     def get_for_director(self, id, sort='title', order='ASC', limit=6, skip=0, user_id=None):
         # TODO: Get Movies directed by a Person
         # TODO: The Cypher string will be formated so remember to escape the braces: {{name: $name}}
         # MATCH (:Person {tmdbId: $id})-[:DIRECTED]->(m:Movie)
 
-        return popular[skip:limit]
+        return popular[skip:skip + limit]
     # end::getForDirector[]
 
     """
@@ -138,6 +633,12 @@ class MovieDAO:
     signify whether the user has added the movie to their "My Favorites" list.
     """
     # tag::findById[]
+    @_overlay_favorites
+    @cached(
+        ttl=MOVIE_CACHE_TTL,
+        key=lambda self, id, **_: f"movie:{id}:{self.database}",
+        store=movie_cache,
+    )
     def find_by_id(self, id, user_id=None):
         # TODO: Find a movie by its ID
         # MATCH (m:Movie {tmdbId: $id})
@@ -145,6 +646,54 @@ class MovieDAO:
         return goodfellas
     # end::findById[]
 
+    def _user_favorites(self, user_id: str) -> frozenset:
+        """
+        Retrieve the tmdbIds of a user's favorite movies, caching them for
+        :data:`LIST_CACHE_TTL` seconds.
+
+        :param user_id: The ID of the user
+        :type user_id: str
+        :return: The tmdbIds of the movies on the user's favorites list
+        :rtype: frozenset
+        """
+        key = _favorites_key(user_id)
+
+        favorites = cache.get(key)
+        if favorites is None:
+            generation = cache.generation
+            with self._read_session() as session:
+                favorites = frozenset(session.execute_read(
+                    self.get_user_favorites, user_id))
+
+            cache.set(key, favorites, LIST_CACHE_TTL, generation=generation)
+
+        return favorites
+
+    def _with_favorites(
+            self,
+            movies: list[dict],
+            user_id: Optional[str],
+    ) -> list[dict]:
+        """
+        Copy a list of movies, flagging those on the user's favorites list.
+
+        :param movies: The movies, as shared by every user
+        :type movies: list[dict]
+        :param user_id: The ID of the user, or None for an anonymous request
+        :type user_id: Optional[str]
+        :return: New movie maps, each with a `favorite` property
+        :rtype: list[dict]
+        """
+        if user_id is None:
+            favorites = frozenset()
+        else:
+            favorites = self._user_favorites(user_id)
+
+        return [
+            {**movie, "favorite": movie.get("tmdbId") in favorites}
+            for movie in movies
+        ]
+
     @staticmethod
     def get_movies(
             tx: Transaction,
@@ -152,8 +701,9 @@ class MovieDAO:
             order: str,
             limit: int,
             skip: int,
-            user_id: Optional[str] = None,
-    ) -> list[Node]:
+            after: Optional[tuple] = None,
+            fields: str = "list",
+    ) -> list[dict]:
         """
         Construct a Cypher query to return a list of movies and execute it.
 
@@ -169,28 +719,58 @@ class MovieDAO:
         :param skip: The index of the row to start including the rows in the
             return value
         :type skip: int
-        :param user_id: The ID of the user who is making the transaction,
-            defaults to None
-        :type user_id: Optional[str]
-        :return: A list of movie nodes that align with the query constructed
+        :param after: The `(sort value, tmdbId)` pair of the last movie on
+            the previous page; when supplied, the page starts after it and
+            :param:`skip` is ignored, defaults to None
+        :type after: Optional[tuple]
+        :param fields: A key of :data:`MOVIE_PROJECTIONS` naming the movie
+            properties to return, defaults to "list"
+        :type fields: str
+        :return: A list of movie maps that align with the query constructed
             from the input specifications
-        :rtype: list[Node]
-        """
-        cypher_query = "\n".join(
-            [
-                "MATCH (m:Movie)",
-                f"WHERE exists(m.`{sort}`)",
-                "RETURN m { .* } AS movie",
-                f"ORDER BY m.`{sort}` {order}",
-                "SKIP $skip",
-                "LIMIT $limit",
-            ]
-        )
-        result = tx.run(
-            query=cypher_query, limit=limit, skip=skip, user_id=user_id)
+        :rtype: list[dict]
+        :raises BadRequestException: If :param:`sort`, :param:`order` or
+            :param:`fields` is not one of the supported values
+        """
+        cypher_query = _MOVIE_QUERIES.get(
+            (sort, order.upper(), after is not None, fields))
+        if cypher_query is None:
+            raise BadRequestException(
+                f"Cannot list {fields} movies sorted by {sort} {order}")
+
+        if after is None:
+            result = tx.run(query=cypher_query, limit=limit, skip=skip)
+        else:
+            after_val, after_id = after
+            result = tx.run(
+                query=cypher_query,
+                limit=limit,
+                after_val=after_val,
+                after_id=after_id,
+            )
 
         return [record.value("movie") for record in result]
 
+    @staticmethod
+    def count_movies(tx: Transaction, sort: str) -> int:
+        """
+        Count the movies that have a value for the :param:`sort` property.
+
+        :param tx: A Neo4j transaction object
+        :type tx: Transaction
+        :param sort: The node property by which the listing is sorted
+        :type sort: str
+        :return: The number of movies with a value for :param:`sort`
+        :rtype: int
+        :raises BadRequestException: If :param:`sort` is not one of the
+            supported values
+        """
+        cypher_query = _COUNT_QUERIES.get(sort)
+        if cypher_query is None:
+            raise BadRequestException(f"Cannot sort movies by {sort}")
+
+        return tx.run(query=cypher_query).single(strict=True).value("count")
+
     """
     This method should return a paginated list of similar movies to the Movie with the
     id supplied.  This similarity is calculated by finding movies that have many first
@@ -205,10 +785,16 @@ class MovieDAO:
     signify whether the user has added the movie to their "My Favorites" list.
     """
     # tag::getSimilarMovies[]
+    @_overlay_favorites
+    @cached(
+        ttl=LIST_CACHE_TTL,
+        key=lambda id, limit, skip, **_:
+            f"movies:similar:{id}:{skip}:{limit}",
+    )
     def get_similar_movies(self, id, limit=6, skip=0, user_id=None):
         # TODO: Get similar movies from Neo4j
 
-        return popular[skip:limit]
+        return popular[skip:skip + limit]
     # end::getSimilarMovies[]
 
 
@@ -218,5 +804,10 @@ class MovieDAO:
     """
     # tag::getUserFavorites[]
     def get_user_favorites(self, tx, user_id):
-        return []
+        result = tx.run("""
+            MATCH (:User {userId: $userId})-[:HAS_FAVORITE]->(m:Movie)
+            RETURN m.tmdbId AS id
+        """, userId=user_id)
+
+        return [record.get("id") for record in result]
     # end::getUserFavorites[]
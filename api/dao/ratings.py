@@ -1,3 +1,4 @@
+from api.dao.movies import clear_movie_cache
 from api.data import ratings
 from api.exceptions.notfound import NotFoundException
 
@@ -22,6 +23,9 @@ class RatingDAO:
         # TODO: Call the function within a write transaction
         # TODO: Return movie details along with a rating
 
+        # The movie's ratingCount has changed
+        clear_movie_cache(movie_id)
+
         return {
             **goodfellas,
             "rating": rating
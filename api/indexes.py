@@ -0,0 +1,69 @@
+from typing import Optional
+
+import click
+from flask import Flask, current_app
+from neo4j import Driver
+
+from api.dao.movies import ALLOWED_SORTS
+
+"""
+Create the indexes that back the movie listing queries.
+
+Each sortable property gets a range index, so the planner can read movies in
+order from the index instead of sorting them, and a composite index with
+`tmdbId` for keyset pagination.
+"""
+
+
+def index_statements() -> list[str]:
+    """
+    Build the statements that create the movie listing indexes.
+
+    :return: A list of `CREATE RANGE INDEX ... IF NOT EXISTS` statements
+    :rtype: list[str]
+    """
+    statements = []
+    for sort in sorted(ALLOWED_SORTS):
+        statements.append(
+            f"CREATE RANGE INDEX movie_{sort} IF NOT EXISTS "
+            f"FOR (m:Movie) ON (m.`{sort}`)"
+        )
+        statements.append(
+            f"CREATE RANGE INDEX movie_{sort}_tmdbId IF NOT EXISTS "
+            f"FOR (m:Movie) ON (m.`{sort}`, m.tmdbId)"
+        )
+
+    return statements
+
+
+def create_indexes(driver: Driver, database: Optional[str] = None) -> None:
+    """
+    Create any missing movie listing indexes.
+
+    :param driver: An instance of a Neo4j Driver with permission to manage
+        indexes
+    :type driver: Driver
+    :param database: The name of the database to create the indexes in,
+        defaults to None which uses the user's home database
+    :type database: Optional[str]
+    """
+    with driver.session(database=database) as session:
+        for statement in index_statements():
+            session.run(statement).consume()
+
+
+def init_app(app: Flask) -> None:
+    """
+    Register the `flask create-indexes` command on the application.
+
+    :param app: The Flask application
+    :type app: Flask
+    """
+    @app.cli.command("create-indexes")
+    def create_indexes_command():
+        """Create the indexes used by the movie listings."""
+        create_indexes(
+            current_app.driver,
+            current_app.config.get("NEO4J_DATABASE") or None,
+        )
+        click.echo(f"Created {len(index_statements())} indexes")
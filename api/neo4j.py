@@ -1,4 +1,7 @@
-from typing import Any
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
 
 import neo4j
 from flask import Flask, current_app
@@ -7,16 +10,103 @@ from neo4j import GraphDatabase
 
 # end::import[]
 
+"""
+Default connection pool settings, used when neither the caller nor the
+application config supplies a value
+"""
+DEFAULT_POOL_SIZE = 50
+DEFAULT_ACQUISITION_TIMEOUT = 60
+DEFAULT_MAX_LIFETIME = 3600
+
+"""
+The most connections opened ahead of time when a driver is created
+"""
+WARM_POOL_SIZE = 16
+
+"""
+Drivers created by `init_driver`, keyed by `(uri, username)`, so that repeated
+calls share a single connection pool rather than opening a new one each time.
+Each driver is stored with the settings it was created with.  The lock guards
+every read and write of the cache.
+"""
+_DRIVER_CACHE: dict[tuple[str, str], tuple[neo4j.Driver, tuple]] = {}
+_DRIVER_LOCK = threading.Lock()
+
+
+def _warm_pool(
+        driver: neo4j.Driver,
+        database: Optional[str],
+        size: int,
+        timeout: float,
+) -> None:
+    """
+    Open :param:`size` pooled connections so that the first requests do not
+    each pay for a new connection.
+
+    Each worker keeps a transaction open until every worker has one.  A
+    session hands its connection back to the pool as soon as a result is
+    consumed, but a transaction holds it until it ends, which forces the
+    driver to open distinct connections rather than reuse one.
+    A worker that fails aborts the barrier so the others stop waiting, and
+    the first failure is raised once every worker has finished.
+
+    :param driver: The driver whose pool to fill
+    :type driver: neo4j.Driver
+    :param database: The name of the database to connect to, or None for the
+        user's home database
+    :type database: Optional[str]
+    :param size: The number of connections to open
+    :type size: int
+    :param timeout: The number of seconds to wait for the other workers
+    :type timeout: float
+    """
+    barrier = threading.Barrier(size, timeout=timeout)
+
+    def warm():
+        try:
+            with driver.session(database=database) as session:
+                with session.begin_transaction() as tx:
+                    tx.run("RETURN 1").consume()
+                    barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        except Exception:
+            barrier.abort()
+            raise
+
+    with ThreadPoolExecutor(max_workers=size) as pool:
+        for future in [pool.submit(warm) for _ in range(size)]:
+            future.result()
+
+
 """
 Initiate the Neo4j Driver
 """
 
 
 # tag::initDriver[]
-def init_driver(uri: str, username: Any, password: Any) -> neo4j.Driver:
+def init_driver(
+        uri: str,
+        username: Any,
+        password: Any,
+        max_pool: Optional[int] = None,
+        acq_timeout: Optional[float] = None,
+        max_lifetime: Optional[float] = None,
+) -> neo4j.Driver:
     """
     Create a driver object and verify the connection to the database.
 
+    A driver is created once per `(uri, username)` pair; subsequent calls
+    with the same pair reuse the cached driver and its connection pool.  A
+    cached driver cannot be reconfigured: a call with a different password
+    or pool setting raises :class:`ValueError` until the driver has been
+    closed with `close_driver`.  A new driver opens up to
+    :data:`WARM_POOL_SIZE` connections up front.
+
+    Any connection pool setting that is not passed explicitly is read from
+    the application config (`NEO4J_POOL_SIZE`, `NEO4J_ACQUISITION_TIMEOUT`
+    and `NEO4J_MAX_LIFETIME`), falling back to the module defaults.
+
     :param uri: The Universal Resource Identifier (URI) of the connection
     :type uri: str
     :param username: The username to use in the authentication details
@@ -24,15 +114,87 @@ def init_driver(uri: str, username: Any, password: Any) -> neo4j.Driver:
     :param password: The password associated with the :param:`username` to use
         in the authentication details
     :type password: Any
+    :param max_pool: The maximum number of connections held in the pool,
+        defaults to None
+    :type max_pool: Optional[int]
+    :param acq_timeout: The number of seconds to wait for a connection from
+        the pool before raising an error, defaults to None
+    :type acq_timeout: Optional[float]
+    :param max_lifetime: The number of seconds a pooled connection may live
+        before it is retired, defaults to None
+    :type max_lifetime: Optional[float]
     :return: An instance of a Neo4j Driver connected via the input :param:`uri`
         and that uses the :param:`username` and :param:`password` as
         authentication credentials
     :rtype: neo4j.Driver
+    :raises ValueError: If a driver for :param:`uri` and :param:`username`
+        already exists with a different password or pool settings
     """
-    current_app.driver = GraphDatabase.driver(uri=uri, auth=(username, password))
-    current_app.driver.verify_connectivity()
-
-    return current_app.driver
+    config = current_app.config
+
+    if max_pool is None:
+        max_pool = int(config.get("NEO4J_POOL_SIZE") or DEFAULT_POOL_SIZE)
+    if acq_timeout is None:
+        acq_timeout = float(
+            config.get("NEO4J_ACQUISITION_TIMEOUT")
+            or DEFAULT_ACQUISITION_TIMEOUT
+        )
+    if max_lifetime is None:
+        max_lifetime = float(
+            config.get("NEO4J_MAX_LIFETIME") or DEFAULT_MAX_LIFETIME)
+
+    key = (uri, username)
+    settings = (
+        hashlib.sha256(str(password).encode("utf8")).hexdigest(),
+        max_pool,
+        acq_timeout,
+        max_lifetime,
+    )
+
+    created = False
+    with _DRIVER_LOCK:
+        if key in _DRIVER_CACHE:
+            driver, cached_settings = _DRIVER_CACHE[key]
+            if cached_settings != settings:
+                raise ValueError(
+                    f"A driver for {uri} as {username} already exists with "
+                    "different settings; close it before creating another"
+                )
+        else:
+            driver = GraphDatabase.driver(
+                uri=uri,
+                auth=(username, password),
+                max_connection_pool_size=max_pool,
+                connection_acquisition_timeout=acq_timeout,
+                max_connection_lifetime=max_lifetime,
+                keep_alive=True,
+            )
+            try:
+                driver.verify_connectivity()
+            except Exception:
+                driver.close()
+                raise
+
+            _DRIVER_CACHE[key] = (driver, settings)
+            created = True
+
+        current_app.driver = driver
+
+    # Warm outside the lock so that other callers are not held up by it.
+    # Warming is an optimisation, so a failure must not stop the app
+    if created:
+        try:
+            _warm_pool(
+                driver,
+                config.get("NEO4J_DATABASE") or None,
+                min(max_pool, WARM_POOL_SIZE),
+                acq_timeout,
+            )
+        except Exception as e:
+            current_app.logger.warning(
+                "Could not warm the Neo4j connection pool: %s", e)
+
+    return driver
 
 
 # end::initDriver[]
@@ -56,10 +218,25 @@ If the driver has been instantiated, close it and all remaining open sessions
 
 
 # tag::closeDriver[]
-def close_driver():
-    if current_app.driver != None:
-        current_app.driver.close()
-        current_app.driver = None
+def close_driver() -> Optional[neo4j.Driver]:
+    """
+    Close the application's driver, if it has one, and remove it from the
+    driver cache so that a later `init_driver` creates a new one.
+
+    Calling this again once the driver is closed does nothing.
+
+    :return: The driver that was closed, or None if there was no driver
+    :rtype: Optional[neo4j.Driver]
+    """
+    with _DRIVER_LOCK:
+        driver = getattr(current_app, "driver", None)
+        if driver is not None:
+            for key, (cached, _) in list(_DRIVER_CACHE.items()):
+                if cached is driver:
+                    del _DRIVER_CACHE[key]
+
+            driver.close()
+            current_app.driver = None
 
-        return current_app.driver
+    return driver
 # end::closeDriver[]
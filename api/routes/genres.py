@@ -2,7 +2,8 @@ from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import current_user, jwt_required
 
 from api.dao.genres import GenreDAO
-from api.dao.movies import MovieDAO
+from api.dao.movies import MovieDAO, executor
+from api.serializers import movies_response
 
 genre_routes = Blueprint("genre", __name__, url_prefix="/api/genres")
 
@@ -37,12 +38,21 @@ def get_genre_movies(name):
     order = request.args.get("order", "ASC")
     limit = request.args.get("limit", 6, type=int)
     skip = request.args.get("skip", 0, type=int)
+    count = request.args.get("count", "false").lower() == "true"
 
-    # Create the DAO
+    # Create the DAOs
     dao = MovieDAO(current_app.driver)
+    genre_dao = GenreDAO(current_app.driver)
+
+    # Look up the genre's movie count alongside the page query, if requested
+    genre = executor.submit(genre_dao.find, name) if count else None
 
     # Get the Genre
     output = dao.get_by_genre(name, sort, order, limit, skip, user_id)
 
-    return jsonify(output)
+    response = movies_response(output)
+    if genre is not None:
+        response.headers["X-Total-Count"] = str(genre.result()["movies"])
+
+    return response
 
@@ -1,11 +1,13 @@
 from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import current_user, jwt_required
 
-from api.dao.movies import MovieDAO
+from api.dao.movies import MovieDAO, decode_cursor, encode_cursor, executor
 from api.dao.ratings import RatingDAO
+from api.serializers import movies_response
 
 movie_routes = Blueprint("movies", __name__, url_prefix="/api/movies")
 
+
 # tag::list[]
 @movie_routes.get('/')
 @jwt_required(optional=True)
@@ -15,6 +17,13 @@ def get_movies():
     order = request.args.get("order", "ASC")
     limit = request.args.get("limit", 6, type=int)
     skip = request.args.get("skip", 0, type=int)
+    after = request.args.get("after")
+    fields = request.args.get("fields", "list")
+    count = request.args.get("count", "false").lower() == "true"
+
+    # Resume after the last movie of the previous page, if a cursor was sent
+    if after is not None:
+        after = decode_cursor(after)
 
     # Get User ID from JWT Auth
     user_id = current_user["sub"] if current_user != None else None
@@ -22,11 +31,28 @@ def get_movies():
     # Create a new MovieDAO Instance
     dao = MovieDAO(current_app.driver)
 
-    # Retrieve a paginated list of movies
-    output = dao.all(sort, order, limit=limit, skip=skip, user_id=user_id)
+    # Count the whole listing alongside the page query, if requested
+    total = executor.submit(dao.count, sort) if count else None
 
-    # Return as JSON
-    return jsonify(output)
+    # Retrieve a paginated list of movies
+    output = dao.all(
+        sort,
+        order,
+        limit=limit,
+        skip=skip,
+        user_id=user_id,
+        after=after,
+        fields=fields,
+    )
+
+    # Return as JSON, with a cursor for the next page if there may be one
+    response = movies_response(output)
+    if output and len(output) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(output[-1], sort)
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total.result())
+
+    return response
 # end::list[]
 
 
@@ -42,7 +68,7 @@ def get_movie_details(movie_id):
     # Get the Movie
     movie = dao.find_by_id(movie_id, user_id)
 
-    return jsonify(movie)
+    return movies_response(movie)
 
 
 @movie_routes.get('/<movie_id>/ratings')
@@ -78,5 +104,5 @@ def get_similar_movies(movie_id):
     # Get Similar Movies
     output = dao.get_similar_movies(movie_id, limit, skip, user_id)
 
-    return jsonify(output)
+    return movies_response(output)
 
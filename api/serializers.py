@@ -0,0 +1,37 @@
+import orjson
+from flask import Response
+
+"""
+JSON encoding for responses that contain movies, using orjson for speed
+"""
+
+
+def _default(value):
+    """
+    Encode values that orjson does not support natively, such as the
+    driver's neo4j.time types, as ISO-8601 strings.
+    """
+    if hasattr(value, "iso_format"):
+        return value.iso_format()
+
+    raise TypeError
+
+
+def _dumps(value) -> bytes:
+    """
+    Encode a value as JSON bytes with orjson.
+    """
+    return orjson.dumps(
+        value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def movies_response(movies) -> Response:
+    """
+    Encode one or more movies as a JSON response using orjson.
+
+    :param movies: A movie or list of movies
+    :type movies: dict | list[dict]
+    :return: A JSON response containing :param:`movies`
+    :rtype: Response
+    """
+    return Response(_dumps(movies), mimetype="application/json")
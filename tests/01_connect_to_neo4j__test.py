@@ -28,4 +28,8 @@ def test_can_close_driver(app):
     with app.app_context():
         driver = close_driver()
 
-        assert driver is None
\ No newline at end of file
+        assert driver is not None
+        assert app.driver is None
+
+        # Closing again is a no-op
+        assert close_driver() is None
\ No newline at end of file
@@ -0,0 +1,107 @@
+import pytest
+
+from api import cache as cache_module
+from api.cache import TTLCache, cached
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    store = TTLCache()
+    store.set("movies:all:a", [1], ttl=60)
+
+    clock[0] += 59
+    assert store.get("movies:all:a") == [1]
+
+    clock[0] += 1
+    assert store.get("movies:all:a") is None
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    store = TTLCache(maxsize=2)
+    store.set("a", 1, ttl=60)
+    store.set("b", 2, ttl=60)
+
+    # Reading "a" makes "b" the least recently used entry
+    assert store.get("a") == 1
+    store.set("c", 3, ttl=60)
+
+    assert store.get("a") == 1
+    assert store.get("b") is None
+    assert store.get("c") == 3
+
+
+def test_invalidate_removes_only_matching_prefix(clock):
+    store = TTLCache()
+    store.set("movies:favorites:u1:", {"1"}, ttl=60)
+    store.set("movies:favorites:u2:", {"2"}, ttl=60)
+    store.set("movies:all:title", [1], ttl=60)
+
+    store.invalidate("movies:favorites:u1:")
+
+    assert store.get("movies:favorites:u1:") is None
+    assert store.get("movies:favorites:u2:") == {"2"}
+    assert store.get("movies:all:title") == [1]
+
+
+def test_terminated_prefix_spares_similar_keys(clock):
+    store = TTLCache()
+    store.set("movies:favorites:u1:", {"1"}, ttl=60)
+    store.set("movies:favorites:u10:", {"10"}, ttl=60)
+
+    store.invalidate("movies:favorites:u1:")
+
+    assert store.get("movies:favorites:u10:") == {"10"}
+
+
+def test_stale_fill_is_not_stored_after_invalidation(clock):
+    store = TTLCache()
+    generation = store.generation
+
+    store.invalidate("movies:favorites:u1:")
+    store.set("movies:favorites:u1:", {"1"}, ttl=60, generation=generation)
+
+    assert store.get("movies:favorites:u1:") is None
+
+
+def test_unrelated_invalidation_does_not_block_fills(clock):
+    store = TTLCache()
+    generation = store.generation
+
+    store.invalidate("movies:favorites:u1:")
+    store.set("movies:all:title", [1], ttl=60, generation=generation)
+
+    assert store.get("movies:all:title") == [1]
+
+
+def test_fills_stay_safe_once_invalidations_are_forgotten(clock):
+    store = TTLCache(maxsize=2)
+    generation = store.generation
+
+    store.invalidate("movies:favorites:u1:")
+    store.invalidate("movies:favorites:u2:")
+    store.invalidate("movies:favorites:u3:")
+    store.set("movies:favorites:u1:", {"1"}, ttl=60, generation=generation)
+
+    assert store.get("movies:favorites:u1:") is None
+
+
+def test_cached_calls_function_once_per_key(clock):
+    store = TTLCache()
+    calls = []
+
+    @cached(ttl=60, key=lambda genre, limit=6: f"genre:{genre}:{limit}",
+            store=store)
+    def by_genre(genre, limit=6):
+        calls.append((genre, limit))
+        return [genre] * limit
+
+    assert by_genre("Comedy") == by_genre("Comedy", limit=6)
+    assert by_genre("Comedy", 2) == ["Comedy", "Comedy"]
+    assert calls == [("Comedy", 6), ("Comedy", 2)]
@@ -0,0 +1,66 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.dao.movies import MovieDAO
+
+key = ("all", "title", "ASC", 6, 0, None, "list")
+
+
+def _start_leader(fetch):
+    """Start a call that holds the key until its fetch is released"""
+    pool = ThreadPoolExecutor(max_workers=6)
+    leader = pool.submit(MovieDAO._coalesce, key, fetch)
+
+    while key not in MovieDAO._INFLIGHT:
+        time.sleep(0.001)
+
+    return pool, leader
+
+
+def test_concurrent_identical_calls_share_one_fetch():
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return [{"tmdbId": "769"}]
+
+    pool, leader = _start_leader(fetch)
+    followers = [pool.submit(MovieDAO._coalesce, key, fetch) for _ in range(5)]
+
+    time.sleep(0.1)
+    release.set()
+
+    results = [leader.result(5)] + [f.result(5) for f in followers]
+    pool.shutdown()
+
+    assert len(calls) == 1
+    assert all(result == [{"tmdbId": "769"}] for result in results)
+    assert key not in MovieDAO._INFLIGHT
+
+
+def test_errors_reach_every_waiting_call():
+    release = threading.Event()
+
+    def fetch():
+        release.wait(5)
+        raise RuntimeError("Neo4j is unavailable")
+
+    pool, leader = _start_leader(fetch)
+    followers = [pool.submit(MovieDAO._coalesce, key, fetch) for _ in range(5)]
+
+    time.sleep(0.1)
+    release.set()
+
+    for future in [leader, *followers]:
+        with pytest.raises(RuntimeError):
+            future.result(5)
+    pool.shutdown()
+
+    # A failed call is not remembered, so the next one fetches again
+    assert key not in MovieDAO._INFLIGHT
+    assert MovieDAO._coalesce(key, lambda: []) == []
@@ -0,0 +1,51 @@
+import base64
+import json
+
+import pytest
+
+from api.dao.movies import _MOVIE_QUERIES, decode_cursor, encode_cursor
+from api.exceptions.badrequest import BadRequestException
+
+
+def _raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def test_cursor_round_trip():
+    movie = {"tmdbId": "769", "title": "GoodFellas", "imdbRating": 8.7}
+
+    assert decode_cursor(encode_cursor(movie, "title")) == ("GoodFellas", "769")
+    assert decode_cursor(encode_cursor(movie, "imdbRating")) == (8.7, "769")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not a cursor",
+    _raw_cursor({"a": 1, "b": 2}),
+    _raw_cursor(["GoodFellas"]),
+    _raw_cursor(["GoodFellas", "769", "extra"]),
+    _raw_cursor([["GoodFellas"], "769"]),
+    _raw_cursor([True, "769"]),
+    _raw_cursor(None),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(BadRequestException):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("order, op", [("ASC", ">"), ("DESC", "<")])
+def test_keyset_query_shape(order, op):
+    query = _MOVIE_QUERIES[("released", order, True, "list")]
+
+    assert "SKIP" not in query
+    assert "LIMIT $limit" in query
+    assert f"m.`released` {op} $after_val" in query
+    assert (f"m.`released` = $after_val AND m.tmdbId {op} $after_id"
+            in query)
+    assert f"ORDER BY m.`released` {order}, m.tmdbId {order}" in query
+
+
+def test_offset_query_breaks_ties_on_tmdb_id():
+    query = _MOVIE_QUERIES[("title", "ASC", False, "list")]
+
+    assert "SKIP $skip" in query
+    assert "ORDER BY m.`title` ASC, m.tmdbId ASC" in query
@@ -0,0 +1,57 @@
+import pytest
+from flask import Flask
+
+from api.dao.movies import (
+    ALLOWED_ORDERS, ALLOWED_SORTS, _MOVIE_QUERIES, MovieDAO)
+from api.exceptions.badrequest import BadRequestException
+
+
+class UnusedDriver:
+    """A driver for tests that must fail before any query is sent"""
+    def session(self, **kwargs):
+        raise AssertionError("No session should be opened")
+
+
+class UnusedTransaction:
+    def run(self, *args, **kwargs):
+        raise AssertionError("No query should be run")
+
+
+@pytest.fixture
+def dao():
+    app = Flask(__name__)
+
+    with app.app_context():
+        yield MovieDAO(UnusedDriver())
+
+
+@pytest.mark.parametrize("sort, order, fields", [
+    ("plot", "ASC", "list"),
+    ("title` DETACH DELETE m //", "ASC", "list"),
+    ("title", "SIDEWAYS", "list"),
+    ("title", "ASC; MATCH (n) DETACH DELETE n", "list"),
+    ("title", "ASC", "everything"),
+])
+def test_all_rejects_unsupported_values(dao, sort, order, fields):
+    with pytest.raises(BadRequestException):
+        dao.all(sort, order, fields=fields)
+
+
+def test_order_is_case_insensitive(dao):
+    # Passing validation means reaching the driver, which this one refuses
+    with pytest.raises(AssertionError, match="No session"):
+        dao.all("title", "desc")
+
+
+def test_queries_are_only_built_for_allowed_values():
+    assert {(sort, order) for sort, order, *_ in _MOVIE_QUERIES} == {
+        (sort, order) for sort in ALLOWED_SORTS for order in ALLOWED_ORDERS
+    }
+
+
+def test_transaction_functions_reject_unsupported_values():
+    with pytest.raises(BadRequestException):
+        MovieDAO.get_movies(UnusedTransaction(), "plot", "ASC", 6, 0)
+
+    with pytest.raises(BadRequestException):
+        MovieDAO.count_movies(UnusedTransaction(), "plot")